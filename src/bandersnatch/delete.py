@@ -3,11 +3,13 @@
 import asyncio
 import concurrent.futures
 import logging
+import os
 from argparse import Namespace
 from configparser import ConfigParser
 from json import JSONDecodeError, load
 from pathlib import Path
 from shutil import rmtree
+from stat import S_ISDIR
 from typing import Awaitable, List
 from urllib.parse import urlparse
 
@@ -23,12 +25,15 @@ def delete_path(blob_path: Path, dry_run: bool = False) -> int:
         logger.info(f" rm {blob_path}")
         return 0
 
-    if not blob_path.exists():
+    # One lstat tells us both whether the path exists and what it is
+    try:
+        blob_stat = os.lstat(blob_path)
+    except FileNotFoundError:
         logger.debug(f"{blob_path} does not exist. Skipping")
         return 0
 
     try:
-        if blob_path.is_dir():
+        if S_ISDIR(blob_stat.st_mode):
             rmtree(blob_path)
         else:
             blob_path.unlink()
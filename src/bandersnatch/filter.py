@@ -1,13 +1,17 @@
 """
 Blacklist management
 """
+import sys
 from collections import defaultdict
 from typing import Any, Dict, Iterable, List
 
-import pkg_resources
-
 from .configuration import BandersnatchConfig
 
+if sys.version_info >= (3, 8):
+    from importlib.metadata import entry_points
+else:
+    import pkg_resources
+
 # The API_REVISION is incremented if the plugin class is modified in a
 # backwards incompatible way.  In order to prevent loading older
 # broken plugins that may be installed and will break due to changes to
@@ -24,6 +28,20 @@ RELEASE_FILE_PLUGIN_RESOURCE = (
 loaded_filter_plugins: Dict[str, List["Filter"]] = defaultdict(list)
 
 
+def iter_entry_points(group: str) -> Iterable[Any]:
+    """
+    Return the entry points registered for group
+
+    importlib.metadata is used where available as pkg_resources scans and
+    parses the metadata of every installed distribution on first use.
+    """
+    if sys.version_info >= (3, 10):
+        return entry_points(group=group)
+    if sys.version_info >= (3, 8):
+        return entry_points().get(group, [])
+    return pkg_resources.iter_entry_points(group=group)
+
+
 class Filter:
     """
     Base Filter class
@@ -113,7 +131,7 @@ class FilterReleaseFilePlugin(Filter):
 
 def load_filter_plugins(entrypoint_group: str) -> Iterable[Filter]:
     """
-    Load all blacklist plugins that are registered with pkg_resources
+    Load all blacklist plugins that are registered as entry points
 
     Parameters
     ==========
@@ -147,7 +165,7 @@ def load_filter_plugins(entrypoint_group: str) -> Iterable[Filter]:
         return cached_plugins
 
     plugins = set()
-    for entry_point in pkg_resources.iter_entry_points(group=entrypoint_group):
+    for entry_point in iter_entry_points(entrypoint_group):
         plugin_class = entry_point.load()
         plugin_instance = plugin_class()
         if "all" in enabled_plugins or plugin_instance.name in enabled_plugins:
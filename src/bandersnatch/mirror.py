@@ -70,6 +70,9 @@ class Mirror:
     ):
         self.loop = asyncio.get_event_loop()
         self.homedir = Path(homedir)
+        # These are looked up for every package synced so only build them once
+        self.webdir = self.homedir / "web"
+        self.todolist = self.homedir / "todo"
         self.master = master
         self.stop_on_error = stop_on_error
         self.json_save = json_save
@@ -92,14 +95,6 @@ class Mirror:
         # Class Instance variable so each package can add their changes
         self.altered_packages = {}
 
-    @property
-    def webdir(self) -> Path:
-        return self.homedir / "web"
-
-    @property
-    def todolist(self) -> Path:
-        return self.homedir / "todo"
-
     async def synchronize(self):
         logger.info(f"Syncing with {self.master.url}.")
         self.now = datetime.datetime.utcnow()
@@ -273,15 +268,29 @@ class Mirror:
         """Given a directory that contains simple packages indexes, return
         a sorted list of normalized package names.  This presumes every
         directory within is a simple package index directory."""
+        # Use the dirent types from scandir rather than stat()ing every entry
+        with os.scandir(simple_dir) as entries:
+            names = set()
+            dirs = set()
+            for entry in entries:
+                names.add(entry.name)
+                if entry.is_dir():
+                    dirs.add(entry.name)
         packages = sorted(
             {
                 # Filter out all of the "non" normalized names here
                 canonicalize_name(x)
-                for x in os.listdir(simple_dir)
+                for x in names
             }
         )
         # Package indexes must be in directories, so ignore anything else.
-        packages = [x for x in packages if os.path.isdir(os.path.join(simple_dir, x))]
+        # Only stat names scandir did not report as a directory - on case
+        # insensitive filesystems "foo" can still resolve to a "Foo/" dir
+        packages = [
+            x
+            for x in packages
+            if x in dirs or os.path.isdir(os.path.join(simple_dir, x))
+        ]
         return packages
 
     def sync_index_page(self):
@@ -312,7 +321,7 @@ class Mirror:
         if self.todolist.exists():
             self.todolist.unlink()
         logger.info(f"New mirror serial: {self.synced_serial}")
-        last_modified = Path(self.homedir) / "web" / "last-modified"
+        last_modified = self.webdir / "last-modified"
         with rewrite(last_modified) as f:
             f.write(self.now.strftime("%Y%m%dT%H:%M:%S\n"))
         self._save()
@@ -412,11 +412,13 @@ class Package:
     async def download_file(
         self, url: str, sha256sum: str, chunk_size: int = 64 * 1024
     ) -> Optional[Path]:
+        loop = asyncio.get_event_loop()
         path = self._file_url_to_local_path(url)
 
         # Avoid downloading again if we have the file and it matches the hash.
         if path.exists():
-            existing_hash = utils.hash(str(path))
+            # Hash in the executor so other package syncers keep running
+            existing_hash = await loop.run_in_executor(None, utils.hash, str(path))
             if existing_hash == sha256sum:
                 return None
             else:
@@ -84,6 +84,13 @@ def test_delete_path() -> None:
             assert delete_path(fake_path, False) == 0
             assert mock_log.call_count == 1
 
+        # Remove directory tree
+        fake_dir = td_path / "unittest-dir"
+        fake_dir.mkdir()
+        (fake_dir / "index.html").touch()
+        assert delete_path(fake_dir, False) == 0
+        assert not fake_dir.exists()
+
 
 @pytest.mark.asyncio
 async def test_delete_packages() -> None:
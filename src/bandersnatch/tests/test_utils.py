@@ -8,10 +8,13 @@ import aiohttp
 import pytest
 
 from bandersnatch.utils import (  # isort:skip
+    HASH_BUFFER_SIZE,
+    compare_files,
     convert_url_to_path,
     hash,
     recursive_find_files,
     rewrite,
+    scan_dir,
     unlink_parent_dir,
     user_agent,
 )
@@ -40,6 +43,41 @@ def test_hash():
     )
 
 
+def test_hash_without_file_digest(monkeypatch):
+    monkeypatch.setattr("bandersnatch.utils._HAS_FILE_DIGEST", False)
+    sample = os.path.join(os.path.dirname(__file__), "sample")
+    assert hash(sample, function="md5") == "125765989403df246cecb48fa3e87ff8"
+    assert hash(sample) == (
+        "95c07c174663ebff531eed59b326ebb3fa95f418f680349fc33b07dfbcf29f18"
+    )
+
+
+def test_compare_files(tmpdir):
+    file1 = tmpdir / "file1"
+    file2 = tmpdir / "file2"
+    file1.write("PyPA ftw!")
+    file2.write("PyPA ftw!")
+    assert compare_files(str(file1), str(file2))
+    file2.write("PyPA FTW!")
+    assert not compare_files(str(file1), str(file2))
+    file2.write("PyPA ftw!!")
+    assert not compare_files(str(file1), str(file2))
+
+
+def test_compare_large_files(tmpdir):
+    file1 = tmpdir / "file1"
+    file2 = tmpdir / "file2"
+    contents = b"P" * (3 * HASH_BUFFER_SIZE)
+    file1.write_binary(contents)
+    file2.write_binary(contents)
+    assert compare_files(str(file1), str(file2))
+    file2.write_binary(contents[:-1] + b"A")
+    assert not compare_files(str(file1), str(file2))
+    middle = len(contents) // 2
+    file2.write_binary(contents[:middle] + b"A" + contents[middle:-1])
+    assert not compare_files(str(file1), str(file2))
+
+
 def test_find_files():
     with TemporaryDirectory() as td:
         td_path = Path(td)
@@ -56,6 +94,36 @@ def test_find_files():
         assert found_files == expected_found_files
 
 
+def test_find_files_follows_symlinked_dirs():
+    with TemporaryDirectory() as td, TemporaryDirectory() as other_volume:
+        td_path = Path(td)
+        (Path(other_volume) / "cd").mkdir()
+        (Path(other_volume) / "cd" / "orphan.whl").touch()
+        (td_path / "ef").symlink_to(other_volume, target_is_directory=True)
+
+        found_files = set()
+        recursive_find_files(found_files, td_path)
+        assert found_files == {td_path / "ef" / "cd" / "orphan.whl"}
+
+
+def test_scan_dir():
+    with TemporaryDirectory() as td:
+        td_path = Path(td)
+        td_sub_path = td_path / "aDir"
+        td_sub_path.mkdir()
+        (td_path / "file1").touch()
+        (td_sub_path / "file2").touch()
+
+        assert scan_dir(td_path) == ([td_sub_path], [td_path / "file1"])
+
+    with TemporaryDirectory() as td, TemporaryDirectory() as other_volume:
+        td_path = Path(td)
+        td_link_path = td_path / "ef"
+        td_link_path.symlink_to(other_volume, target_is_directory=True)
+
+        assert scan_dir(td_path) == ([td_link_path], [])
+
+
 def test_rewrite(tmpdir, monkeypatch):
     monkeypatch.chdir(tmpdir)
     with open("sample", "w") as f:
@@ -86,6 +154,16 @@ def test_rewrite_nonexisting_file(tmpdir, monkeypatch):
         assert f.read() == "csdf"
 
 
+def test_rewrite_removed_tmpfile(tmpdir, monkeypatch):
+    monkeypatch.chdir(tmpdir)
+    with open("sample", "w") as f:
+        f.write("bsdf")
+    with rewrite("sample") as f:
+        f.write("csdf")
+        os.unlink(f.name)
+    assert open("sample").read() == "bsdf"
+
+
 def test_unlink_parent_dir():
     adir = Path(gettempdir()) / f"tb.{os.getpid()}"
     adir.mkdir()
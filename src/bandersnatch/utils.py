@@ -1,5 +1,5 @@
 import contextlib
-import filecmp
+import functools
 import hashlib
 import logging
 import os
@@ -7,8 +7,9 @@ import os.path
 import platform
 import sys
 import tempfile
+import threading
 from pathlib import Path
-from typing import IO, Any, Generator, List, Set, Union
+from typing import IO, Any, Dict, Generator, List, Set, Tuple, Union
 from urllib.parse import urlparse
 
 import aiohttp
@@ -36,17 +37,63 @@ def convert_url_to_path(url: str) -> str:
     return urlparse(url).path[1:]
 
 
-def hash(path: str, function: str = "sha256") -> str:
-    h = getattr(hashlib, function)()
-    with open(path, "rb") as f:
-        while True:
-            chunk = f.read(128 * 1024)
-            if not chunk:
-                break
-            h.update(chunk)
+HASH_BUFFER_SIZE = 1024 * 1024
+_HAS_FILE_DIGEST = sys.version_info >= (3, 11)
+TAIL_COMPARE_SIZE = 128
+_thread_local = threading.local()
+_hash_templates: Dict[str, Any] = {}
+
+
+def _hash_buffer() -> bytearray:
+    # hash() is run from executor threads, keep one read buffer per thread
+    # rather than allocating a new one for every file
+    buf = getattr(_thread_local, "hash_buffer", None)
+    if buf is None:
+        buf = _thread_local.hash_buffer = bytearray(HASH_BUFFER_SIZE)
+    return buf
+
+
+def _new_hash(function: str) -> Any:
+    # Copying a pristine hash object is cheaper than looking up and
+    # initialising a new one. The templates are never updated so they can be
+    # shared between threads.
+    template = _hash_templates.get(function)
+    if template is None:
+        template = _hash_templates[function] = getattr(hashlib, function)()
+    return template.copy()
+
+
+def _hash_fileobj(f: IO[bytes], function: str) -> str:
+    if _HAS_FILE_DIGEST:
+        # file_digest runs the read/update loop in C
+        return hashlib.file_digest(  # type: ignore
+            f, functools.partial(_new_hash, function)
+        ).hexdigest()
+    h = _new_hash(function)
+    buf = _hash_buffer()
+    view = memoryview(buf)
+    while True:
+        read = f.readinto(buf)  # type: ignore
+        if not read:
+            break
+        h.update(view[:read])
     return h.hexdigest()
 
 
+def hash(path: str, function: str = "sha256") -> str:
+    with open(path, "rb", buffering=0) as f:
+        if not hasattr(os, "posix_fadvise"):
+            return _hash_fileobj(f, function)
+        # Read ahead aggressively and drop the pages once hashed so verifying
+        # a mirror does not evict everything else from the page cache
+        fd = f.fileno()
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        try:
+            return _hash_fileobj(f, function)
+        finally:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+
 def find(root: Union[Path, str], dirs: bool = True) -> str:
     """A test helper simulating 'find'.
 
@@ -74,12 +121,7 @@ def rewrite(
 ) -> Generator[IO, None, None]:
     """Rewrite an existing file atomically to avoid programs running in
     parallel to have race conditions while reading."""
-    if isinstance(filepath, str):
-        base_dir = os.path.dirname(filepath)
-        filename = os.path.basename(filepath)
-    else:
-        base_dir = str(filepath.parent)
-        filename = filepath.name
+    base_dir, filename = os.path.split(os.fspath(filepath))
 
     # Change naming format to be more friendly with distributed POSIX
     # filesystems like GlusterFS that hash based on filename
@@ -90,34 +132,84 @@ def rewrite(
         filepath_tmp = f.name
         yield f
 
-    if not os.path.exists(filepath_tmp):
+    try:
+        os.chmod(filepath_tmp, 0o100644)
+    except FileNotFoundError:
         # Allow our clients to remove the file in case it doesn't want it to be
         # put in place actually but also doesn't want to error out.
         return
-    os.chmod(filepath_tmp, 0o100644)
-    os.rename(filepath_tmp, filepath)
-
-
-def recursive_find_files(files: Set[Path], base_dir: Path):
-    dirs = [d for d in base_dir.iterdir() if d.is_dir()]
-    files.update([x for x in base_dir.iterdir() if x.is_file()])
-    for directory in dirs:
-        recursive_find_files(files, directory)
+    os.replace(filepath_tmp, filepath)
+
+
+def recursive_find_files(files: Set[Path], base_dir: Path) -> None:
+    # Walk with an explicit stack over os.scandir so the dirent type is used
+    # instead of stat()ing every entry - only symlinks need a stat, and they
+    # are followed like before as shards may be linked to other volumes
+    dirs = [os.fspath(base_dir)]
+    while dirs:
+        with os.scandir(dirs.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    dirs.append(entry.path)
+                elif entry.is_file():
+                    files.add(Path(entry.path))
+
+
+def scan_dir(base_dir: Path) -> Tuple[List[Path], List[Path]]:
+    """ Return the directories and files directly inside base_dir """
+    dirs: List[Path] = []
+    files: List[Path] = []
+    with os.scandir(base_dir) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                dirs.append(Path(entry.path))
+            elif entry.is_file():
+                files.append(Path(entry.path))
+    return dirs, files
 
 
 def unlink_parent_dir(path: Path) -> None:
     """ Remove a file and if the dir is empty remove it """
     logger.info(f"unlink {str(path)}")
-    path.unlink()
+    os.unlink(path)
 
-    parent_path = path.parent
+    parent_path = os.path.dirname(path)
     try:
-        parent_path.rmdir()
+        os.rmdir(parent_path)
         logger.info(f"rmdir {str(parent_path)}")
     except OSError as oe:
         logger.debug(f"Did not remove {str(parent_path)}: {str(oe)}")
 
 
+def compare_files(file1: Union[Path, str], file2: Union[Path, str]) -> bool:
+    """Return True if both files have identical contents.
+
+    Files of different size are rejected without reading them, otherwise
+    both are compared in HASH_BUFFER_SIZE chunks."""
+    size = os.stat(file1).st_size
+    if size != os.stat(file2).st_size:
+        return False
+
+    # Buffered reads keep going until n bytes or EOF, a raw read may return
+    # short and make identical files look different
+    with open(file1, "rb") as f1, open(file2, "rb") as f2:
+        if size > HASH_BUFFER_SIZE:
+            # The first chunk covers the start of the file, check the end
+            # before reading everything in between
+            f1.seek(-TAIL_COMPARE_SIZE, os.SEEK_END)
+            f2.seek(-TAIL_COMPARE_SIZE, os.SEEK_END)
+            if f1.read(TAIL_COMPARE_SIZE) != f2.read(TAIL_COMPARE_SIZE):
+                return False
+            f1.seek(0)
+            f2.seek(0)
+        while True:
+            chunk = f1.read(HASH_BUFFER_SIZE)
+            if chunk != f2.read(HASH_BUFFER_SIZE):
+                return False
+            if not chunk:
+                return True
+
+
 @contextlib.contextmanager
 def update_safe(filename: str, **kw: Any) -> Generator[IO, None, None]:
     """Rewrite a file atomically.
@@ -139,8 +231,8 @@ def update_safe(filename: str, **kw: Any) -> Generator[IO, None, None]:
         if not os.path.exists(tf.name):
             return
         filename_tmp = tf.name
-    if os.path.exists(filename) and filecmp.cmp(filename, filename_tmp, shallow=False):
+    if os.path.exists(filename) and compare_files(filename, filename_tmp):
         os.unlink(filename_tmp)
     else:
-        os.rename(filename_tmp, filename)
+        os.replace(filename_tmp, filename)
         tf.has_changed = True  # type: ignore
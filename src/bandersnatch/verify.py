@@ -22,6 +22,7 @@ from bandersnatch.utils import (  # isort:skip
     convert_url_to_path,
     hash,
     recursive_find_files,
+    scan_dir,
     unlink_parent_dir,
 )
 
@@ -58,10 +59,18 @@ async def delete_unowned_files(
 ) -> int:
     loop = asyncio.get_event_loop()
     packages_path = Path(mirror_base) / "web/packages"
-    all_fs_files = set()  # type: Set[Path]
-    await loop.run_in_executor(
-        executor, recursive_find_files, all_fs_files, packages_path
+    top_dirs, top_files = await loop.run_in_executor(executor, scan_dir, packages_path)
+    # web/packages is sharded into hash prefix directories so walk each of
+    # them in parallel rather than the whole tree in one thread
+    dir_files = [set() for _ in top_dirs]  # type: List[Set[Path]]
+    await asyncio.gather(
+        *[
+            loop.run_in_executor(executor, recursive_find_files, files, top_dir)
+            for files, top_dir in zip(dir_files, top_dirs)
+        ]
     )
+    all_fs_files = set(top_files)  # type: Set[Path]
+    all_fs_files.update(*dir_files)
 
     all_package_files_set = set(all_package_files)
     unowned_files = all_fs_files - all_package_files_set